@@ -15,19 +15,46 @@
 #   along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import argparse
+import atexit
+import copy
+import functools
+import json
 import os
 import sys
+import time
 import traceback
 from datetime import datetime, timedelta
-from typing import List
-
-import requests
-import yaml
-from cerberus import Validator
+from types import MappingProxyType
+from typing import List, Mapping
 
 API_ENDPOINT = 'https://app.groupalarm.com/api/v1'
+ALARM_ENDPOINT = API_ENDPOINT + '/alarm'
+ALARM_PREVIEW_ENDPOINT = ALARM_ENDPOINT + '/preview'
+HTTP_TIMEOUT = (3.05, 10)  # (connect, read) in seconds
+ENTITY_CACHE_TTL_IN_S = 60
 DEFAULT_CONFIG_FILE_PATH = r'../config/config.yaml'
-YAML_CONFIG_FILE_SCHEMA = {
+CONFIG_CACHE_FILE_SUFFIX = '.cache.json'
+CONFIG_VALIDATION_REVISION = 2  # increase on validation changes outside of the schemas to invalidate the cache files
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+# the schemas are read-only, the validator libraries receive modifiable copies because they may normalize them
+YAML_CONFIG_FILE_SCHEMA = _freeze({
     'config': {
         'type': 'dict',
         'schema': {
@@ -51,8 +78,8 @@ YAML_CONFIG_FILE_SCHEMA = {
             },
             'alarms': {
                 'type': 'dict',
-                'keyschema': {'type': 'string', 'minlength': 5, 'maxlength': 5},
-                'valueschema': {
+                'keysrules': {'type': 'string', 'minlength': 5, 'maxlength': 5},
+                'valuesrules': {
                     'type': 'dict',
                     'schema': {
                         'resources': {
@@ -64,8 +91,8 @@ YAML_CONFIG_FILE_SCHEMA = {
                                     'excludes': ['allUsers', 'scenarios', 'units'],
                                     'schema': {
                                         'type': 'dict',
-                                        'keyschema': {'type': 'string'},
-                                        'valueschema': {'type': 'integer', 'min': 1},
+                                        'keysrules': {'type': 'string'},
+                                        'valuesrules': {'type': 'integer', 'min': 1},
                                         'minlength': 1,
                                         'maxlength': 1
                                     }
@@ -90,55 +117,304 @@ YAML_CONFIG_FILE_SCHEMA = {
             }
         }
     }
+})
+
+# equivalent JSON schema of `YAML_CONFIG_FILE_SCHEMA`, used if the package `fastjsonschema` is installed
+JSON_CONFIG_FILE_SCHEMA = _freeze({
+    'type': 'object',
+    'properties': {
+        'login': {
+            'type': 'object',
+            'properties': {
+                'organization-id': {'type': 'integer'},
+                'api-token': {'type': 'string'}
+            },
+            'additionalProperties': False
+        },
+        'proxy': {
+            'type': 'object',
+            'properties': {
+                'address': {'type': 'string'},
+                'port': {'type': 'integer'},
+                'username': {'type': 'string'},
+                'password': {'type': 'string'}
+            },
+            'required': ['address', 'port'],
+            'additionalProperties': False
+        },
+        'alarms': {
+            'type': 'object',
+            'patternProperties': {
+                # `\Z` instead of `$`, which would also accept a trailing newline
+                '^.{5}\\Z': {
+                    'type': 'object',
+                    'properties': {
+                        'resources': {
+                            'type': 'object',
+                            'properties': {
+                                'allUsers': {'type': 'boolean'},
+                                'labels': {
+                                    'type': 'array',
+                                    'items': {
+                                        'type': 'object',
+                                        'propertyNames': {'type': 'string'},
+                                        'additionalProperties': {'type': 'integer', 'minimum': 1},
+                                        'minProperties': 1,
+                                        'maxProperties': 1
+                                    }
+                                },
+                                'scenarios': {
+                                    'type': 'array',
+                                    'items': {'type': 'string'}
+                                },
+                                'units': {
+                                    'type': 'array',
+                                    'items': {'type': 'string'}
+                                }
+                            },
+                            'oneOf': [
+                                {'required': ['allUsers']},
+                                {'required': ['labels']},
+                                {'required': ['scenarios']},
+                                {'required': ['units']}
+                            ],
+                            'additionalProperties': False
+                        },
+                        'message': {'type': 'string'},
+                        'messageTemplate': {'type': 'string'},
+                        'closeEventInHours': {'type': 'integer', 'minimum': 0}
+                    },
+                    'required': ['resources'],
+                    'oneOf': [
+                        {'required': ['message']},
+                        {'required': ['messageTemplate']}
+                    ],
+                    'additionalProperties': False
+                }
+            },
+            'additionalProperties': False
+        }
+    },
+    'required': ['alarms'],
+    'additionalProperties': False
+})
 
-}
 
+# the heavier dependencies are imported on first use so that invalid command line arguments fail without delay
+@functools.lru_cache(maxsize=None)
+def _get_config_validator():
+    try:
+        import fastjsonschema
+    except ImportError:
+        from cerberus import Validator
+
+        validator = Validator(_thaw(YAML_CONFIG_FILE_SCHEMA), require_all=True)
+
+        def validate_with_cerberus(config):
+            if not validator.validate({'config': config}):
+                raise SyntaxError(validator.errors)
+
+        return validate_with_cerberus
+
+    compiled_validator = fastjsonschema.compile(_thaw(JSON_CONFIG_FILE_SCHEMA))
+
+    def validate_with_fastjsonschema(config):
+        try:
+            compiled_validator(config)
+        except fastjsonschema.JsonSchemaException as e:
+            raise SyntaxError(e.message)
+        except TypeError:
+            # the alarm code patterns cannot be matched against keys that are no strings, e.g. unquoted alarm codes
+            raise SyntaxError('data.alarms must only contain strings as alarm codes')
+
+        # JSON schema also accepts floats like 1.0 as integers, Cerberus does not
+        integer_fields = [
+            ('data.login.organization-id', config.get('login', {}).get('organization-id')),
+            ('data.proxy.port', config.get('proxy', {}).get('port'))
+        ]
+        for alarm_code, alarm_config in config['alarms'].items():
+            integer_fields.append((f'data.alarms.{alarm_code}.closeEventInHours',
+                                   alarm_config.get('closeEventInHours')))
+            for index, label in enumerate(alarm_config['resources'].get('labels', [])):
+                for label_name, amount in label.items():
+                    integer_fields.append((f'data.alarms.{alarm_code}.resources.labels[{index}].{label_name}', amount))
+        for field_name, value in integer_fields:
+            if isinstance(value, float):
+                raise SyntaxError(f'{field_name} must be integer')
+
+    return validate_with_fastjsonschema
+
+
+@functools.lru_cache(maxsize=None)
+def _get_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+    session.headers.update({'Content-Type': 'application/json'})
+    atexit.register(session.close)
+
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def _get_json_functions():
+    try:
+        from orjson import dumps, loads
+    except ImportError:
+        loads = json.loads
+
+        def dumps(obj):
+            return json.dumps(obj).encode()
+
+    return dumps, loads
+
+
+def _json_dumps(obj) -> bytes:
+    return _get_json_functions()[0](obj)
+
+
+def _json_loads(data):
+    return _get_json_functions()[1](data)
 
-def get_header(api_token):
-    return {
-        'Content-Type': 'application/json',
-        'API-Token': api_token
-    }
 
+# validated configurations by absolute file path, stored together with the modification time and size of the file
+_CONFIG_CACHE = {}
 
-def read_config_file(config_file_path):
+
+def _get_yaml_loader():
     try:
-        with open(config_file_path) as yaml_file:
-            config = yaml.load(yaml_file, Loader=yaml.FullLoader)
+        from yaml import CSafeLoader as Loader
+    except ImportError:
+        # PyYAML has been installed without libyaml
+        from yaml import SafeLoader as Loader
+
+    return Loader
+
+
+@functools.lru_cache(maxsize=None)
+def _get_config_schema_version():
+    import hashlib
+
+    # a cached configuration has only been validated against the schemas that were valid at that time
+    schemas = json.dumps([CONFIG_VALIDATION_REVISION, _thaw(YAML_CONFIG_FILE_SCHEMA), _thaw(JSON_CONFIG_FILE_SCHEMA)],
+                         sort_keys=True)
+    return hashlib.sha256(schemas.encode()).hexdigest()
+
+
+def _read_config_cache(cache_file_path, file_signature):
+    mtime, size = file_signature
+    try:
+        with open(cache_file_path, 'rb') as cache_file:
+            cache = _json_loads(cache_file.read())
+        if cache['mtime'] == mtime and cache['size'] == size and cache['schemaVersion'] == _get_config_schema_version():
+            return cache['config']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    return None
 
-        v = Validator(require_all=True)
-        if not v.validate({'config': config}, YAML_CONFIG_FILE_SCHEMA):
-            raise SyntaxError(v.errors)
 
-        if 'login' not in config:
-            config['login'] = {}
+def _write_config_cache(cache_file_path, file_signature, config):
+    import tempfile
+
+    # the cache is only an optimization, failing to write it (e.g. in a read-only directory) is not an error
+    try:
+        file_descriptor, temp_file_path = tempfile.mkstemp(dir=os.path.dirname(cache_file_path),
+                                                           suffix=CONFIG_CACHE_FILE_SUFFIX)
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as cache_file:
+            mtime, size = file_signature
+            cache_file.write(_json_dumps({'mtime': mtime, 'size': size, 'schemaVersion': _get_config_schema_version(),
+                                          'config': config}))
+        os.replace(temp_file_path, cache_file_path)
+    except OSError:
+        try:
+            os.remove(temp_file_path)
+        except OSError:
+            pass
+
+
+def _load_config(config_file_path, use_cache, do_validate):
+    file_stat = os.stat(config_file_path)
+    file_signature = (file_stat.st_mtime_ns, file_stat.st_size)
+    abs_config_file_path = os.path.abspath(config_file_path)
+    if use_cache and abs_config_file_path in _CONFIG_CACHE:
+        cached_file_signature, config = _CONFIG_CACHE[abs_config_file_path]
+        if cached_file_signature == file_signature:
+            return config
+
+    cache_file_path = config_file_path + CONFIG_CACHE_FILE_SUFFIX
+    config = None
+    if use_cache:
+        config = _read_config_cache(cache_file_path, file_signature)
+    if config is None:
+        import yaml
+
+        with open(config_file_path, 'rb') as yaml_file:
+            config = yaml.load(yaml_file.read(), Loader=_get_yaml_loader())
+
+        # only validated configurations may be cached because a cache hit skips the validation
+        if not do_validate:
+            return config
+
+        _get_config_validator()(config)
+
+        if use_cache:
+            _write_config_cache(cache_file_path, file_signature, config)
+
+    _CONFIG_CACHE[abs_config_file_path] = (file_signature, config)
+
+    return config
+
+
+def read_config_file(config_file_path, use_cache=True, do_validate=True):
+    try:
+        # the cached configuration is shared between calls, every caller gets its own copy to modify
+        config = copy.deepcopy(_load_config(config_file_path, use_cache, do_validate))
+        config.setdefault('login', {})
+
+        env_organization_id = os.environ.get('ORGANIZATION_ID')
+        env_api_token = os.environ.get('API_TOKEN')
 
         if 'organization-id' not in config['login']:
-            if 'ORGANIZATION_ID' not in os.environ:
+            if env_organization_id is None:
                 raise EnvironmentError('The Groupalarm organization id either needs to be provided in the environment '
                                        'variable ORGANIZATION_ID or in the YAML configuration file')
-            config['login']['organization-id'] = int(os.getenv('ORGANIZATION_ID'))
+            config['login']['organization-id'] = int(env_organization_id)
         else:
-            if 'ORGANIZATION_ID' in os.environ:
+            if env_organization_id is not None:
                 raise EnvironmentError('The Groupalarm organization id is both provided in the environment variable '
                                        'ORGANIZATION_ID as well as in the YAML configuration file')
 
         if 'api-token' not in config['login']:
-            if 'API_TOKEN' not in os.environ:
+            if env_api_token is None:
                 raise EnvironmentError('The Groupalarm API token either needs to be provided in the environment '
                                        'variable API-TOKEN or in the YAML configuration file')
-            config['login']['api-token'] = os.getenv('API_TOKEN')
+            config['login']['api-token'] = env_api_token
         else:
-            if 'API_TOKEN' in os.environ:
+            if env_api_token is not None:
                 raise EnvironmentError('The Groupalarm API token is both provided in the environment variable '
                                        'API_TOKEN as well as in the YAML configuration file')
 
         return config
     except Exception as e:
-        print(f'Fehler beim Lesen der Konfigurationsdatei: {e}', file=sys.stderr)
+        # the file is parsed from memory, so the YAML errors themselves do not name it
+        print(f'Fehler beim Lesen der Konfigurationsdatei "{config_file_path}": {e}', file=sys.stderr)
         raise
 
 
+read_config_file.cache_clear = _CONFIG_CACHE.clear
+
+
+# name to id maps by (organization id, sub endpoint), stored together with the time of the download
+_ENTITY_CACHE = {}
+
+
 def _get_proxies(proxy_config):
     if not proxy_config:
         return {}
@@ -162,35 +438,39 @@ def _get_proxies(proxy_config):
         return {'https': f'https://{address}:{port}'}
 
 
-def _get_entity_ids_from_endpoint(entity_names, organization_id, api_token, proxy_config, sub_endpoint,
-                                  organization_param='organization') -> List[int]:
-    r = requests.get(API_ENDPOINT + f'/{sub_endpoint}?{organization_param}={organization_id}',
-                     headers=get_header(api_token), proxies=_get_proxies(proxy_config))
-    json_response = _get_json_response(r)
+def _fetch_entity_map(sub_endpoint, organization_id, organization_param, proxies) -> Mapping[str, int]:
+    cache_key = (organization_id, sub_endpoint)
+    cache_entry = _ENTITY_CACHE.get(cache_key)
+    if cache_entry:
+        download_time, entity_id_map = cache_entry
+        if time.monotonic() - download_time < ENTITY_CACHE_TTL_IN_S:
+            return entity_id_map
+
+    r = _get_session().get(f'{API_ENDPOINT}/{sub_endpoint}', params={organization_param: organization_id},
+                           proxies=proxies, timeout=HTTP_TIMEOUT)
     r.raise_for_status()
 
-    entity_id_map = {}
-    for entry in json_response:
-        entity_id_map[entry['name']] = entry['id']
+    entity_id_map = MappingProxyType({entry['name']: entry['id'] for entry in _json_loads(r.content)})
+    _ENTITY_CACHE[cache_key] = (time.monotonic(), entity_id_map)
+
+    return entity_id_map
 
-    found_entity_names = []
-    entity_ids = []
-    for entity_name in entity_names:
-        if entity_name in entity_id_map:
-            entity_ids.append(entity_id_map[entity_name])
-            found_entity_names.append(entity_name)
 
-    if len(entity_ids) != len(entity_names):
-        missing_entities = set(entity_names).difference(set(found_entity_names))
+def _get_entity_ids_from_endpoint(entity_names, organization_id, proxies, sub_endpoint,
+                                  organization_param='organization') -> List[int]:
+    entity_id_map = _fetch_entity_map(sub_endpoint, organization_id, organization_param, proxies)
+
+    missing_entities = [entity_name for entity_name in entity_names if entity_name not in entity_id_map]
+    if missing_entities:
         raise ValueError(f'Did not find the following *{sub_endpoint}* in the Groupalarm '
                          f'organization {organization_id}: ' + ', '.join(missing_entities))
 
-    return entity_ids
+    return [entity_id_map[entity_name] for entity_name in entity_names]
 
 
 def _get_json_response(r):
     if 'Content-Type' in r.headers and r.headers.get('Content-Type').startswith('application/json'):
-        response = r.json()
+        response = _json_loads(r.content)
         if 'success' in response and 'error' in response and not response['success']:
             message = response['message']
             details = response['error']
@@ -201,24 +481,24 @@ def _get_json_response(r):
     return response
 
 
-def get_ids_for_units(unit_names, organization_id, api_token, proxy_config) -> List[int]:
-    return _get_entity_ids_from_endpoint(unit_names, organization_id, api_token, proxy_config, 'units')
+def get_ids_for_units(unit_names, organization_id, proxies) -> List[int]:
+    return _get_entity_ids_from_endpoint(unit_names, organization_id, proxies, 'units')
 
 
-def get_ids_for_labels(label_names, organization_id, api_token, proxy_config) -> List[int]:
-    return _get_entity_ids_from_endpoint(label_names, organization_id, api_token, proxy_config, 'labels')
+def get_ids_for_labels(label_names, organization_id, proxies) -> List[int]:
+    return _get_entity_ids_from_endpoint(label_names, organization_id, proxies, 'labels')
 
 
-def get_ids_for_users(user_names, organization_id, api_token, proxy_config) -> List[int]:
-    return _get_entity_ids_from_endpoint(user_names, organization_id, api_token, proxy_config, 'users')
+def get_ids_for_users(user_names, organization_id, proxies) -> List[int]:
+    return _get_entity_ids_from_endpoint(user_names, organization_id, proxies, 'users')
 
 
-def get_ids_for_scenarios(scenario_names, organization_id, api_token, proxy_config) -> List[int]:
-    return _get_entity_ids_from_endpoint(scenario_names, organization_id, api_token, proxy_config, 'scenarios')
+def get_ids_for_scenarios(scenario_names, organization_id, proxies) -> List[int]:
+    return _get_entity_ids_from_endpoint(scenario_names, organization_id, proxies, 'scenarios')
 
 
-def get_alarm_template_id(alarm_template_name, organization_id, api_token, proxy_config) -> int:
-    return _get_entity_ids_from_endpoint([alarm_template_name], organization_id, api_token, proxy_config,
+def get_alarm_template_id(alarm_template_name, organization_id, proxies) -> int:
+    return _get_entity_ids_from_endpoint([alarm_template_name], organization_id, proxies,
                                          'alarms/templates', 'organization_id')[0]
 
 
@@ -226,15 +506,6 @@ def to_isoformat_string(time_point: datetime):
     return time_point.isoformat() + 'Z'
 
 
-def get_close_event_time_period(alarm_code, config):
-    _check_alarm_code_has_config(alarm_code, config)
-
-    if 'closeEventInHours' not in config['alarms'][alarm_code]:
-        return None
-
-    return timedelta(hours=config['alarms'][alarm_code]['closeEventInHours'])
-
-
 def send_alarm(config, alarm_time_point, alarm_code, alarm_type, do_emit_alarm):
     try:
         organization_id = config['login']['organization-id']
@@ -243,31 +514,46 @@ def send_alarm(config, alarm_time_point, alarm_code, alarm_type, do_emit_alarm):
             proxy_config = config['proxy']
         else:
             proxy_config = None
+        proxies = _get_proxies(proxy_config)
+
+        _check_alarm_code_has_config(alarm_code, config)
+        alarm_config = config['alarms'][alarm_code]
+
+        # the session is created here before it is shared by the worker threads
+        session = _get_session()
+        session.headers['API-Token'] = api_token
 
-        alarm_resources = get_alarm_resources(alarm_code, api_token, config, organization_id, proxy_config)
-        alarm_template_id, message = get_alarm_message(alarm_code, config, organization_id, api_token, proxy_config)
+        from concurrent.futures import ThreadPoolExecutor
 
+        # the lookups for the resources and the message are independent HTTP requests and can run in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            alarm_resources_future = executor.submit(get_alarm_resources, alarm_config, organization_id, proxies)
+            alarm_message_future = executor.submit(get_alarm_message, alarm_config, organization_id, proxies)
+            alarm_resources = alarm_resources_future.result()
+            alarm_template_id, message = alarm_message_future.result()
+
+        now = datetime.utcnow()
         request_body = {
             'alarmResources': alarm_resources,
             'organizationID': organization_id,
-            'startTime': to_isoformat_string(datetime.utcnow()),
+            'startTime': to_isoformat_string(now),
             'eventName': f'[Funkmelderalarm] Schleife {alarm_code} {alarm_time_point} ({alarm_type})'
         }
 
-        close_event_time_period = get_close_event_time_period(alarm_code, config)
-        if close_event_time_period:
-            request_body['scheduledEndTime'] = to_isoformat_string(datetime.utcnow() + close_event_time_period)
+        close_event_in_hours = alarm_config.get('closeEventInHours')
+        if close_event_in_hours:
+            request_body['scheduledEndTime'] = to_isoformat_string(now + timedelta(hours=close_event_in_hours))
 
         if message:
             request_body['message'] = message
         elif alarm_template_id:
             request_body['alarmTemplateID'] = alarm_template_id
 
-        preview_endpoint = ''
-        if not do_emit_alarm:
-            preview_endpoint = '/preview'
-        r = requests.post(API_ENDPOINT + '/alarm' + preview_endpoint, headers=get_header(api_token), json=request_body,
-                          proxies=_get_proxies(proxy_config))
+        if do_emit_alarm:
+            alarm_endpoint = ALARM_ENDPOINT
+        else:
+            alarm_endpoint = ALARM_PREVIEW_ENDPOINT
+        r = session.post(alarm_endpoint, data=_json_dumps(request_body), proxies=proxies, timeout=HTTP_TIMEOUT)
         _get_json_response(r)
         r.raise_for_status()
 
@@ -280,47 +566,39 @@ def send_alarm(config, alarm_time_point, alarm_code, alarm_type, do_emit_alarm):
         raise
 
 
-def get_alarm_message(alarm_code, config, organization_id, api_token, proxy_config):
-    _check_alarm_code_has_config(alarm_code, config)
-
+def get_alarm_message(alarm_config, organization_id, proxies):
     message = None
     alarm_template_id = None
 
-    alarm_config = config['alarms'][alarm_code]
     if 'message' in alarm_config:
         message = alarm_config['message']
     elif 'messageTemplate' in alarm_config:
-        alarm_template_id = get_alarm_template_id(alarm_config['messageTemplate'], organization_id, api_token,
-                                                  proxy_config)
+        alarm_template_id = get_alarm_template_id(alarm_config['messageTemplate'], organization_id, proxies)
     else:
         raise ValueError('Incorrect YAML configuration file: no alarm message')
 
     return alarm_template_id, message
 
 
-def get_alarm_resources(alarm_code, api_token, config, organization_id, proxy_config):
-    _check_alarm_code_has_config(alarm_code, config)
-
-    resources = config['alarms'][alarm_code]['resources']
+def get_alarm_resources(alarm_config, organization_id, proxies):
+    resources = alarm_config['resources']
     if 'allUsers' in resources and resources['allUsers']:
         alarm_resources = {'allUsers': True}
     elif 'labels' in resources:
-        label_names = []
-        for entry in resources['labels']:
-            label_names.append(list(entry.keys())[0])
-        label_ids = get_ids_for_labels(label_names, organization_id, api_token, proxy_config)
-        labels_array = []
-        for index, entry in enumerate(resources['labels']):
-            labels_array.append({'amount': list(entry.values())[0], 'labelID': label_ids[index]})
+        # each label entry is a single-item dict mapping the label name to the requested amount
+        label_pairs = [next(iter(entry.items())) for entry in resources['labels']]
+        label_ids = get_ids_for_labels([label_name for label_name, _ in label_pairs], organization_id, proxies)
+        labels_array = [{'amount': amount, 'labelID': label_id}
+                        for (_, amount), label_id in zip(label_pairs, label_ids)]
         alarm_resources = {'labels': labels_array}
     elif 'units' in resources:
-        unit_ids = get_ids_for_units(resources['units'], organization_id, api_token, proxy_config)
+        unit_ids = get_ids_for_units(resources['units'], organization_id, proxies)
         alarm_resources = {'units': unit_ids}
     elif 'users' in resources:
-        user_ids = get_ids_for_users(resources['users'], organization_id, api_token, proxy_config)
+        user_ids = get_ids_for_users(resources['users'], organization_id, proxies)
         alarm_resources = {'users': user_ids}
     elif 'scenarios' in resources:
-        scenario_ids = get_ids_for_scenarios(resources['scenarios'], organization_id, api_token, proxy_config)
+        scenario_ids = get_ids_for_scenarios(resources['scenarios'], organization_id, proxies)
         alarm_resources = {'scenarios': scenario_ids}
     else:
         raise ValueError('Incorrect YAML configuration file: no alarm resources')
@@ -348,6 +626,13 @@ def get_command_line_arguments():
         parser.add_argument('-c', '--config-file',
                             help='Path to the YAML configuration file, if not provided the default '
                                  'configuration file `config/config.yaml` is used')
+        parser.add_argument('--no-config-cache', action='store_true',
+                            help='Always read and validate the YAML configuration file instead of using the cache file '
+                                 'stored next to it')
+        parser.add_argument('--no-validate', action='store_true',
+                            help='Skip the validation of a changed YAML configuration file, only for trusted '
+                                 'configuration files (alternatively set the environment variable '
+                                 'PERSONALFME_TRUST_CONFIG=1)')
 
         args = parser.parse_args()
         do_emit_alarm = not args.test
@@ -358,7 +643,10 @@ def get_command_line_arguments():
             config_file_path = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
                                                             DEFAULT_CONFIG_FILE_PATH))
 
-        return args.time_point, args.code, args.type, do_emit_alarm, config_file_path, args.debug
+        do_validate_config = not args.no_validate and os.environ.get('PERSONALFME_TRUST_CONFIG') != '1'
+
+        return args.time_point, args.code, args.type, do_emit_alarm, config_file_path, args.debug, \
+            not args.no_config_cache, do_validate_config
     except Exception as e:
         print(f'Fehler beim Verarbeiten der Aufrufparameter: {e}', file=sys.stderr)
         raise
@@ -368,13 +656,16 @@ def main():
     is_debug_mode = True  # only valid until overwritten by the command line arguments
     # noinspection PyBroadException
     try:
-        alarm_time_point, alarm_code, alarm_type, do_emit_alarm, config_file_path, is_debug_mode = \
-            get_command_line_arguments()
+        alarm_time_point, alarm_code, alarm_type, do_emit_alarm, config_file_path, is_debug_mode, use_config_cache, \
+            do_validate_config = get_command_line_arguments()
 
         if is_debug_mode:
             print('Aufrufparameter: ' + ','.join(sys.argv))
+            if _get_yaml_loader().__name__ != 'CSafeLoader':
+                print('Hinweis: PyYAML ist ohne libyaml installiert, die Konfigurationsdatei wird daher langsamer '
+                      'gelesen', file=sys.stderr)
 
-        config = read_config_file(config_file_path)
+        config = read_config_file(config_file_path, use_config_cache, do_validate_config)
         send_alarm(config, alarm_time_point, alarm_code, alarm_type, do_emit_alarm)
     except Exception:
         if is_debug_mode: